@@ -0,0 +1,168 @@
+"""
+Shared HTTP helpers for the Adaptogen scrapers.
+
+Retries transient failures with exponential backoff and spaces requests per host,
+stretching the spacing whenever the server answers with ``Retry-After`` or
+``X-RateLimit-*`` headers.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Coroutine, Dict, Mapping, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import uvloop
+except ImportError:  # optional; not available on Windows
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # seconds; doubled on every retry
+MAX_SERVER_DELAY = 300  # cap on waits requested through response headers (seconds)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """``Retry-After`` as seconds from now; accepts delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_ratelimit_reset(value: Optional[str]) -> Optional[float]:
+    """``X-RateLimit-Reset`` as seconds from now; accepts a delta or a Unix timestamp."""
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    return reset - time.time() if reset > 1e9 else reset
+
+
+class HostRateLimiter:
+    """Per-host concurrency cap plus a minimum interval between request starts."""
+
+    def __init__(self, max_concurrency: int, min_interval: float):
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self._semaphores: Dict[str, asyncio.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+        self._paused_until: Dict[str, float] = {}
+
+    def semaphore(self, host: str) -> asyncio.BoundedSemaphore:
+        """Semaphore bounding in-flight requests to ``host``."""
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.BoundedSemaphore(self.max_concurrency)
+        return sem
+
+    async def wait_turn(self, host: str) -> None:
+        """Reserve the next start slot for ``host`` and sleep until it arrives."""
+        while True:
+            now = time.monotonic()
+            start = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            if time.monotonic() >= self._paused_until.get(host, 0.0):
+                return
+            # defer() paused the host while we slept; queue again behind the pause.
+
+    def defer(self, host: str, seconds: float) -> None:
+        """Hold back every request to ``host`` for at least ``seconds``."""
+        seconds = min(max(seconds, 0.0), MAX_SERVER_DELAY)
+        until = time.monotonic() + seconds
+        if until > self._paused_until.get(host, 0.0):
+            logger.warning(f"Server asked to slow down; pausing {host} for {seconds:.1f}s")
+            self._paused_until[host] = until
+            self._next_slot[host] = max(until, self._next_slot.get(host, 0.0))
+
+    def observe(self, host: str, headers: Mapping[str, str]) -> None:
+        """Apply ``Retry-After`` / exhausted ``X-RateLimit-*`` hints from a response."""
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            self.defer(host, retry_after)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.strip() == "0":
+            reset = _parse_ratelimit_reset(headers.get("X-RateLimit-Reset"))
+            if reset is not None:
+                self.defer(host, reset)
+
+
+async def read_all(response: httpx.Response) -> bytes:
+    """Default body reader: the whole (decompressed) payload as bytes."""
+    return await response.aread()
+
+
+async def fetch_with_retry(
+    url: str,
+    client: httpx.AsyncClient,
+    limiter: HostRateLimiter,
+    read_body: Callable[[httpx.Response], Awaitable[T]] = read_all,
+    headers: Optional[Mapping[str, str]] = None,
+) -> T:
+    """
+    GET ``url`` and return ``read_body(response)``, retrying transient failures.
+
+    Connection errors, timeouts and 429/5xx answers are retried up to ``MAX_RETRIES``
+    times with exponential backoff plus jitter; other HTTP errors fail immediately.
+    ``read_body`` runs inside the retry loop, so a stream dropped mid-body is retried
+    like any other transport error. Extra request ``headers`` may make the request
+    conditional; a ``304 Not Modified`` answer is then handed to ``read_body`` as well.
+
+    Raises:
+        httpx.HTTPStatusError: on a non-2xx answer that is not retried, or the last one.
+        httpx.TransportError: when the final attempt fails to connect, stalls or times out.
+    """
+    host = urlsplit(url).netloc
+
+    for attempt in range(MAX_RETRIES):
+        async with limiter.semaphore(host):
+            await limiter.wait_turn(host)
+            try:
+                async with client.stream("GET", url, headers=headers) as response:
+                    limiter.observe(host, response.headers)
+                    if response.status_code in RETRY_STATUSES:
+                        error = httpx.HTTPStatusError(
+                            f"{response.status_code} {response.reason_phrase} for {url}",
+                            request=response.request,
+                            response=response,
+                        )
+                    else:
+                        if response.status_code != 304:
+                            response.raise_for_status()
+                        return await read_body(response)
+            except httpx.TransportError as e:
+                error = e
+
+        if attempt == MAX_RETRIES - 1:
+            break
+        delay = BACKOFF_BASE * 2 ** attempt + random.uniform(0, 0.5)
+        logger.warning(
+            f"Retry {attempt + 1}/{MAX_RETRIES - 1} for {url} in {delay:.1f}s: {error}"
+        )
+        await asyncio.sleep(delay)
+
+    raise error
+
+
+def run_event_loop(main: Coroutine[None, None, T]) -> T:
+    """``asyncio.run`` on a uvloop event loop when uvloop is installed."""
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -12,8 +12,6 @@ Author: Sidnei Almeida (github.com/sidnei-almeida)
 import os
 import sys
 import time
-import glob
-from datetime import datetime
 # ============================================================================
 # ANSI COLORS FOR TERMINAL OUTPUT
 # ============================================================================
@@ -28,17 +26,16 @@ class Colors:
     MAGENTA = '\033[95m'
     WHITE = '\033[97m'
 
+def colorize(color: str, text: str) -> str:
+    """Wrap text in an ANSI color sequence terminated by a reset."""
+    return f"{color}{text}{Colors.RESET}"
+
 # ============================================================================
-# UTILITIES
+# STATIC SCREENS (encoded once at import)
 # ============================================================================
-def clear_screen():
-    """Clear the terminal."""
-    os.system('clear' if os.name == 'posix' else 'cls')
-
-def print_banner():
-    """Print the application banner."""
-    banner = f"""
-{Colors.CYAN}{Colors.BOLD}
+_BANNER_BYTES = (
+    "\n"
+    + colorize(Colors.CYAN + Colors.BOLD, """
 ╔══════════════════════════════════════════════════════════════╗
 ║              Adaptogen Scraper — v1.0                        ║
 ║                                                              ║
@@ -48,48 +45,144 @@ def print_banner():
 ║  Nutritional facts table parsing                             ║
 ║  Export to JSON & CSV                                         ║
 ╚══════════════════════════════════════════════════════════════╝
-{Colors.RESET}"""
-    print(banner)
+""")
+    + "\n"
+).encode("utf-8")
 
-def print_progress_bar(message: str, duration_sec: float = 2.0):
-    """Display an animated terminal progress bar."""
-    print(f"\n{Colors.YELLOW}Waiting — {message}...{Colors.RESET}")
-    bar_len = 40
-    for i in range(bar_len + 1):
-        progress = i / bar_len
-        bar = "█" * i + "░" * (bar_len - i)
-        pct = int(progress * 100)
-        print(f"\r{Colors.GREEN}[{bar}] {pct}%{Colors.RESET}", end="", flush=True)
-        time.sleep(duration_sec / bar_len)
-    print()
+_MENU_BYTES = f"""
+{colorize(Colors.BLUE + Colors.BOLD, "══════════════════ MAIN MENU ══════════════════")}
 
-def print_main_menu():
-    """Print the main menu."""
-    menu = f"""
-{Colors.BLUE}{Colors.BOLD}══════════════════ MAIN MENU ══════════════════{Colors.RESET}
+{colorize(Colors.GREEN, "Primary actions:")}
+  {colorize(Colors.YELLOW, "1.")} Collect product URLs — all categories
+  {colorize(Colors.YELLOW, "2.")} Extract nutritional tables — per product pages
+  {colorize(Colors.YELLOW, "3.")} Full pipeline — collection + extraction
 
-{Colors.GREEN}Primary actions:{Colors.RESET}
-  {Colors.YELLOW}1.{Colors.RESET} Collect product URLs — all categories
-  {Colors.YELLOW}2.{Colors.RESET} Extract nutritional tables — per product pages
-  {Colors.YELLOW}3.{Colors.RESET} Full pipeline — collection + extraction
+{colorize(Colors.GREEN, "Data management:")}
+  {colorize(Colors.YELLOW, "4.")} List generated files — JSON & CSV artifacts
+  {colorize(Colors.YELLOW, "5.")} Delete data files — clears json/ and dados_extraidos/
 
-{Colors.GREEN}Data management:{Colors.RESET}
-  {Colors.YELLOW}4.{Colors.RESET} List generated files — JSON & CSV artifacts
-  {Colors.YELLOW}5.{Colors.RESET} Delete data files — clears json/ and dados_extraidos/
+{colorize(Colors.GREEN, "Info:")}
+  {colorize(Colors.YELLOW, "6.")} About — version, tech stack, output layout
+  {colorize(Colors.YELLOW, "7.")} Quit
 
-{Colors.GREEN}Info:{Colors.RESET}
-  {Colors.YELLOW}6.{Colors.RESET} About — version, tech stack, output layout
-  {Colors.YELLOW}7.{Colors.RESET} Quit
+{colorize(Colors.BLUE, "══════════════════════════════════════════════════════════")}
 
-{Colors.BLUE}══════════════════════════════════════════════════════════{Colors.RESET}
-"""
-    print(menu)
+""".encode("utf-8")
+
+# The About screen only varies by the month stamp, spliced between these halves.
+_ABOUT_PREFIX = f"""
+{Colors.CYAN}{Colors.BOLD}ABOUT — ADAPTOGEN SCRAPER{Colors.RESET}
+{Colors.BLUE}{'-' * 60}{Colors.RESET}
+
+{Colors.GREEN}Purpose:{Colors.RESET}
+   Collect and export nutritional facts from Adaptogen products
+   (adaptogen.com.br) for spreadsheet-style analysis.
+
+{Colors.GREEN}Features:{Colors.RESET}
+   • Four storefront categories scraped for product links
+   • Automatic pagination on the Protein category listing
+   • Structured parsing of the nutrition table block (`div.flow` → `table`)
+   • Outputs JSON URL index + flattened CSV metric rows
+   • Missing numeric cells normalized to zero
+   • Per-run collection timestamp (`data_coleta`)
+
+{Colors.GREEN}Stack:{Colors.RESET}
+   • Python (see local interpreter version)
+   • httpx — async HTTP/2 client with keep-alive and compression
+   • uvloop — faster asyncio event loop where available (optional)
+   • BeautifulSoup — listing-page parsing
+   • lxml — product-page parsing via compiled XPath
+
+{Colors.GREEN}Outputs:{Colors.RESET}
+   • json/produtos_urls.json — category buckets of absolute URLs
+   • dados_extraidos/produtos_nutricionais.csv — macros + metadata columns
+
+{Colors.GREEN}Behavior:{Colors.RESET}
+   • Browser-like request headers (User-Agent, Accept-*)
+   • Up to 16 requests in flight per host (`MAX_CONCURRENCY`)
+   • Request starts to a host spaced 0.125 s apart (`REQUEST_DELAY / MAX_CONCURRENCY`)
+
+{Colors.GREEN}Author:{Colors.RESET}
+   Sidnei Almeida — https://github.com/sidnei-almeida
+   Version 1.0 — """.encode("utf-8")
+
+_ABOUT_SUFFIX = f"""
+
+{Colors.BLUE}{'-' * 60}{Colors.RESET}
+
+""".encode("utf-8")
+
+# ============================================================================
+# PROGRESS BAR FRAMES
+# ============================================================================
+_BAR_LEN = 40
+_BARS = [("█" * i + "░" * (_BAR_LEN - i), int(i * 100 / _BAR_LEN)) for i in range(_BAR_LEN + 1)]
+_FRAMES = [f"\r{Colors.GREEN}[{bar}] {pct}%{Colors.RESET}" for bar, pct in _BARS]
+_FRAME_INTERVAL = 0.05  # seconds between redraws
+
+# Accepted confirmations for y/N prompts (English + Portuguese)
+_YES = frozenset({"y", "yes", "s", "sim"})
+
+# ============================================================================
+# FILE SIZE UNITS — (divisor, suffix, decimals) indexed by bit_length() // 10
+# ============================================================================
+_SIZE_UNITS = [(1, "B", 0), (1024, "KB", 1), (1024 ** 2, "MB", 1), (1024 ** 3, "GB", 2)]
+
+# ============================================================================
+# UTILITIES
+# ============================================================================
+def clear_screen():
+    """Clear the terminal with an ANSI escape (set ADAPTOGEN_SAFE_CLEAR=1 to shell out instead)."""
+    if os.environ.get("ADAPTOGEN_SAFE_CLEAR") == "1":
+        os.system('clear' if os.name == 'posix' else 'cls')
+        return
+    sys.stdout.write("\033[2J\033[H")
+    sys.stdout.flush()
+
+def write_bytes(*chunks: bytes):
+    """Write pre-encoded bytes straight to stdout's binary buffer."""
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(b"".join(chunks).decode("utf-8"))
+        return
+    for chunk in chunks:
+        buffer.write(chunk)
+    buffer.flush()
+
+def print_banner():
+    """Print the application banner."""
+    write_bytes(_BANNER_BYTES)
+
+def print_progress_bar(message: str, duration_sec: float = 2.0):
+    """Display an animated terminal progress bar, redrawing at most every 50 ms."""
+    print(f"\n{Colors.YELLOW}Waiting — {message}...{Colors.RESET}")
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    start = time.monotonic()
+    last_print = float("-inf")
+    while True:
+        now = time.monotonic()
+        elapsed = now - start
+        if elapsed >= duration_sec:
+            break
+        if now - last_print >= _FRAME_INTERVAL:
+            write(_FRAMES[int(elapsed / duration_sec * _BAR_LEN)])
+            flush()
+            last_print = now
+        time.sleep(_FRAME_INTERVAL)
+    write(_FRAMES[-1] + "\n")
+    flush()
+
+def print_main_menu():
+    """Print the main menu."""
+    write_bytes(_MENU_BYTES)
 
 def prompt_choice() -> str:
-    """Read user's menu selection."""
+    """Read user's menu selection; anything but a single character comes back as ""."""
     try:
         choice = input(f"{Colors.MAGENTA}Enter option (1-7): {Colors.RESET}").strip()
-        return choice
+        return choice if len(choice) == 1 else ""
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}Interrupted.{Colors.RESET}")
         sys.exit(0)
@@ -97,6 +190,23 @@ def prompt_choice() -> str:
 # ============================================================================
 # Adaptogen scraper workflows
 # ============================================================================
+_url_collector = None
+_nutritional_scraper = None
+
+def _get_url_collector():
+    """Import ``url_collector`` on first use and reuse the module afterwards."""
+    global _url_collector
+    if _url_collector is None:
+        import url_collector as _url_collector
+    return _url_collector
+
+def _get_nutritional_scraper():
+    """Import ``nutritional_scraper`` on first use and reuse the module afterwards."""
+    global _nutritional_scraper
+    if _nutritional_scraper is None:
+        import nutritional_scraper as _nutritional_scraper
+    return _nutritional_scraper
+
 
 def collect_urls():
     """Run URL collection."""
@@ -111,17 +221,17 @@ def collect_urls():
     
     print(f"\n{Colors.GREEN}Output:{Colors.RESET} {Colors.YELLOW}json/produtos_urls.json{Colors.RESET}")
     
-    reply = input(f"\n{Colors.MAGENTA}Start collection? (y/N): {Colors.RESET}").lower()
+    reply = input(f"\n{Colors.MAGENTA}Start collection? (y/N): {Colors.RESET}").strip().casefold()
     
-    if reply in {"y", "yes", "s", "sim"}:
+    if reply in _YES:
         try:
             print_progress_bar("Starting URL crawl", 1.5)
             
             print(f"\n{Colors.GREEN}Running...{Colors.RESET}\n")
             print(f"{Colors.BLUE}{'=' * 60}{Colors.RESET}")
             
-            import url_collector
-            url_collector.main()
+            sys.stdout.flush()  # scraper logs go to stderr
+            _get_url_collector().main()
             
             print(f"{Colors.BLUE}{'=' * 60}{Colors.RESET}")
             print(f"\n{Colors.GREEN}URL collection finished.{Colors.RESET}")
@@ -143,23 +253,23 @@ def extract_nutrition():
     
     print(f"\n{Colors.YELLOW}Note:{Colors.RESET}")
     print(f"   This may take {Colors.RED}several minutes{Colors.RESET}.")
-    print(f"   Each product page is fetched individually.")
-    print(f"   A 2-second delay is applied between HTTP requests.")
+    print(f"   Product pages are fetched concurrently (up to 16 at once).")
+    print(f"   Request starts to the site are spaced 0.125 s apart (about 8 per second).")
     
     print(f"\n{Colors.GREEN}Input:{Colors.RESET} {Colors.YELLOW}json/produtos_urls.json{Colors.RESET}")
     print(f"{Colors.GREEN}Output:{Colors.RESET} {Colors.YELLOW}dados_extraidos/produtos_nutricionais.csv{Colors.RESET}")
     
-    reply = input(f"\n{Colors.MAGENTA}Start extraction? (y/N): {Colors.RESET}").lower()
+    reply = input(f"\n{Colors.MAGENTA}Start extraction? (y/N): {Colors.RESET}").strip().casefold()
     
-    if reply in {"y", "yes", "s", "sim"}:
+    if reply in _YES:
         try:
             print_progress_bar("Preparing extraction", 1.5)
             
             print(f"\n{Colors.GREEN}Running...{Colors.RESET}\n")
             print(f"{Colors.BLUE}{'=' * 60}{Colors.RESET}")
             
-            import nutritional_scraper
-            nutritional_scraper.main()
+            sys.stdout.flush()  # scraper logs go to stderr
+            _get_nutritional_scraper().main()
             
             print(f"{Colors.BLUE}{'=' * 60}{Colors.RESET}")
             print(f"\n{Colors.GREEN}Extraction finished.{Colors.RESET}")
@@ -180,9 +290,9 @@ def run_full_pipeline():
     
     print(f"\n{Colors.YELLOW}This process can take a long time.{Colors.RESET}")
     
-    reply = input(f"\n{Colors.MAGENTA}Run full pipeline? (y/N): {Colors.RESET}").lower()
+    reply = input(f"\n{Colors.MAGENTA}Run full pipeline? (y/N): {Colors.RESET}").strip().casefold()
     
-    if reply in {"y", "yes", "s", "sim"}:
+    if reply in _YES:
         try:
             start = time.time()
             
@@ -190,18 +300,17 @@ def run_full_pipeline():
             print(f"{Colors.BOLD}STEP 1 / 2 — URL COLLECTION{Colors.RESET}")
             print(f"{Colors.CYAN}{'=' * 60}{Colors.RESET}\n")
             
-            import url_collector
-            url_collector.main()
+            sys.stdout.flush()  # scraper logs go to stderr
+            _get_url_collector().main()
             
             print(f"\n{Colors.GREEN}Step 1 complete.{Colors.RESET}")
-            time.sleep(2)
             
             print(f"\n{Colors.CYAN}{'=' * 60}{Colors.RESET}")
             print(f"{Colors.BOLD}STEP 2 / 2 — NUTRITIONAL EXTRACTION{Colors.RESET}")
             print(f"{Colors.CYAN}{'=' * 60}{Colors.RESET}\n")
             
-            import nutritional_scraper
-            nutritional_scraper.main()
+            sys.stdout.flush()  # scraper logs go to stderr
+            _get_nutritional_scraper().main()
             
             elapsed = time.time() - start
             
@@ -218,8 +327,29 @@ def run_full_pipeline():
     else:
         print(f"{Colors.YELLOW}Canceled.{Colors.RESET}")
 
+def _format_size(n: int) -> str:
+    """Human-readable byte count (B / KB / MB / GB)."""
+    i = min(max(0, (n.bit_length() - 1) // 10), len(_SIZE_UNITS) - 1)
+    div, unit, decimals = _SIZE_UNITS[i]
+    return f"{n / div:.{decimals}f} {unit}" if i else f"{n} B"
+
+def _scan_entries(folder: str, suffix: str | tuple) -> list:
+    """``DirEntry`` objects for non-hidden files in ``folder`` ending with ``suffix``; [] if absent."""
+    if not os.path.isdir(folder):
+        return []
+    with os.scandir(folder) as it:
+        return [e for e in it if e.name.endswith(suffix) and not e.name.startswith(".")]
+
+def _list_dir(folder: str, suffix: str) -> list:
+    """``(name, stat_result)`` pairs for files in ``folder`` ending with ``suffix``, newest first."""
+    entries = [(e.name, e.stat()) for e in _scan_entries(folder, suffix)]
+    entries.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    return entries
+
 def list_generated_files():
     """List generated JSON and CSV artifacts."""
+    from datetime import datetime
+    
     print(f"\n{Colors.CYAN}{Colors.BOLD}GENERATED FILES{Colors.RESET}")
     print(f"{Colors.BLUE}{'-' * 60}{Colors.RESET}")
     
@@ -229,23 +359,17 @@ def list_generated_files():
     folder_json = "json"
     
     if os.path.exists(folder_json):
-        json_files = glob.glob(f"{folder_json}/*.json")
+        json_files = _list_dir(folder_json, ".json")
         
         if json_files:
-            for i, path in enumerate(sorted(json_files, reverse=True), 1):
-                base = os.path.basename(path)
-                size = os.path.getsize(path)
-                mtime = datetime.fromtimestamp(os.path.getmtime(path))
+            for i, (base, st) in enumerate(json_files, 1):
+                mtime = datetime.fromtimestamp(st.st_mtime)
+                size_s = _format_size(st.st_size)
                 
-                if size < 1024:
-                    size_s = f"{size} B"
-                elif size < 1024 * 1024:
-                    size_s = f"{size / 1024:.1f} KB"
-                else:
-                    size_s = f"{size / (1024 * 1024):.1f} MB"
-                
-                print(f"\n{Colors.YELLOW}{i:2d}.{Colors.RESET} {Colors.WHITE}{base}{Colors.RESET}")
-                print(f"     {mtime.strftime('%Y-%m-%d %H:%M:%S')}  ({size_s})")
+                sys.stdout.write(
+                    f"\n{Colors.YELLOW}{i:2d}.{Colors.RESET} {Colors.WHITE}{base}{Colors.RESET}\n"
+                    f"     {mtime.strftime('%Y-%m-%d %H:%M:%S')}  ({size_s})\n"
+                )
                 count += 1
         else:
             print(f"   {Colors.YELLOW}No JSON files found.{Colors.RESET}")
@@ -256,23 +380,17 @@ def list_generated_files():
     folder_csv = "dados_extraidos"
     
     if os.path.exists(folder_csv):
-        csv_files = glob.glob(f"{folder_csv}/*.csv")
+        csv_files = _list_dir(folder_csv, ".csv")
         
         if csv_files:
-            for i, path in enumerate(sorted(csv_files, reverse=True), 1):
-                base = os.path.basename(path)
-                size = os.path.getsize(path)
-                mtime = datetime.fromtimestamp(os.path.getmtime(path))
-                
-                if size < 1024:
-                    size_s = f"{size} B"
-                elif size < 1024 * 1024:
-                    size_s = f"{size / 1024:.1f} KB"
-                else:
-                    size_s = f"{size / (1024 * 1024):.1f} MB"
+            for i, (base, st) in enumerate(csv_files, 1):
+                mtime = datetime.fromtimestamp(st.st_mtime)
+                size_s = _format_size(st.st_size)
                 
-                print(f"\n{Colors.YELLOW}{i:2d}.{Colors.RESET} {Colors.WHITE}{base}{Colors.RESET}")
-                print(f"     {mtime.strftime('%Y-%m-%d %H:%M:%S')}  ({size_s})")
+                sys.stdout.write(
+                    f"\n{Colors.YELLOW}{i:2d}.{Colors.RESET} {Colors.WHITE}{base}{Colors.RESET}\n"
+                    f"     {mtime.strftime('%Y-%m-%d %H:%M:%S')}  ({size_s})\n"
+                )
                 count += 1
         else:
             print(f"   {Colors.YELLOW}No CSV files found.{Colors.RESET}")
@@ -287,9 +405,10 @@ def wipe_generated_files():
     print(f"\n{Colors.CYAN}{Colors.BOLD}DELETE GENERATED FILES{Colors.RESET}")
     print(f"{Colors.BLUE}{'-' * 60}{Colors.RESET}")
     
-    json_paths = glob.glob("json/*.json") if os.path.exists("json") else []
-    csv_paths = glob.glob("dados_extraidos/*.csv") if os.path.exists("dados_extraidos") else []
-    total = len(json_paths) + len(csv_paths)
+    json_entries = _scan_entries("json", ".json")
+    # .part / .tmp: left behind by an interrupted run
+    csv_entries = _scan_entries("dados_extraidos", (".csv", ".csv.part", ".csv.tmp"))
+    total = len(json_entries) + len(csv_entries)
     
     if total == 0:
         print(f"\n{Colors.GREEN}Nothing to delete.{Colors.RESET}")
@@ -297,8 +416,8 @@ def wipe_generated_files():
     
     print(f"\n{Colors.YELLOW}Warning:{Colors.RESET}")
     print(f"   {Colors.RED}{total} file(s){Colors.RESET} will be permanently removed:")
-    print(f"     • {len(json_paths)} JSON")
-    print(f"     • {len(csv_paths)} CSV")
+    print(f"     • {len(json_entries)} JSON")
+    print(f"     • {len(csv_entries)} CSV")
     print(f"   This action {Colors.RED}cannot be undone.{Colors.RESET}")
     
     confirm = input(f"\n{Colors.MAGENTA}Type CONFIRM to proceed: {Colors.RESET}")
@@ -306,10 +425,15 @@ def wipe_generated_files():
     if confirm == "CONFIRM":
         try:
             removed = 0
-            for p in json_paths + csv_paths:
-                os.remove(p)
-                removed += 1
-                print(f"{Colors.YELLOW}Removed: {os.path.basename(p)}{Colors.RESET}")
+            messages = []
+            try:
+                for entry in json_entries + csv_entries:
+                    os.unlink(entry.path)
+                    removed += 1
+                    messages.append(f"{Colors.YELLOW}Removed: {entry.name}{Colors.RESET}")
+            finally:
+                if messages:
+                    sys.stdout.write("\n".join(messages) + "\n")
             
             print(f"\n{Colors.GREEN}{removed} file(s) deleted.{Colors.RESET}")
         except Exception as e:
@@ -319,53 +443,33 @@ def wipe_generated_files():
 
 def print_about():
     """Show project information."""
-    about = f"""
-{Colors.CYAN}{Colors.BOLD}ABOUT — ADAPTOGEN SCRAPER{Colors.RESET}
-{Colors.BLUE}{'-' * 60}{Colors.RESET}
-
-{Colors.GREEN}Purpose:{Colors.RESET}
-   Collect and export nutritional facts from Adaptogen products
-   (adaptogen.com.br) for spreadsheet-style analysis.
-
-{Colors.GREEN}Features:{Colors.RESET}
-   • Four storefront categories scraped for product links
-   • Automatic pagination on the Protein category listing
-   • Structured parsing of the nutrition table block (`div.flow` → `table`)
-   • Outputs JSON URL index + flattened CSV metric rows
-   • Missing numeric cells normalized to zero
-   • Per-row collection timestamp (`data_coleta`)
-
-{Colors.GREEN}Stack:{Colors.RESET}
-   • Python (see local interpreter version)
-   • requests — HTTP
-   • BeautifulSoup — HTML parsing
-   • lxml — fast backend for BeautifulSoup
-
-{Colors.GREEN}Outputs:{Colors.RESET}
-   • json/produtos_urls.json — category buckets of absolute URLs
-   • dados_extraidos/produtos_nutricionais.csv — macros + metadata columns
-
-{Colors.GREEN}Behavior:{Colors.RESET}
-   • Browser-like request headers (User-Agent, Accept-*)
-   • 2-second delay between requests (`REQUEST_DELAY`)
-
-{Colors.GREEN}Author:{Colors.RESET}
-   Sidnei Almeida — https://github.com/sidnei-almeida
-   Version 1.0 — {datetime.now().strftime('%B %Y')}
-
-{Colors.BLUE}{'-' * 60}{Colors.RESET}
-"""
-    print(about)
+    from datetime import datetime
+    write_bytes(_ABOUT_PREFIX, datetime.now().strftime('%B %Y').encode("utf-8"), _ABOUT_SUFFIX)
 
 def wait_for_continue():
     """Pause until Enter is pressed."""
     input(f"\n{Colors.CYAN}Press Enter to continue...{Colors.RESET}")
 
+# Menu key → handler; "7" (quit) is handled inline in main().
+_ACTIONS = {
+    "1": collect_urls,
+    "2": extract_nutrition,
+    "3": run_full_pipeline,
+    "4": list_generated_files,
+    "5": wipe_generated_files,
+    "6": print_about,
+}
+
 # ============================================================================
 # Entry point
 # ============================================================================
 def main():
     """Run the interactive menu loop."""
+    # Block-buffer stdout while the menu runs: a redraw is dozens of lines and
+    # line buffering would flush each one. input() flushes before prompting.
+    line_buffered = getattr(sys.stdout, "line_buffering", False)
+    if line_buffered:
+        sys.stdout.reconfigure(line_buffering=False)
     try:
         while True:
             clear_screen()
@@ -374,28 +478,9 @@ def main():
             
             choice = prompt_choice()
             
-            if choice == "1":
-                collect_urls()
-                wait_for_continue()
-                
-            elif choice == "2":
-                extract_nutrition()
-                wait_for_continue()
-                
-            elif choice == "3":
-                run_full_pipeline()
-                wait_for_continue()
-                
-            elif choice == "4":
-                list_generated_files()
-                wait_for_continue()
-                
-            elif choice == "5":
-                wipe_generated_files()
-                wait_for_continue()
-                
-            elif choice == "6":
-                print_about()
+            action = _ACTIONS.get(choice)
+            if action:
+                action()
                 wait_for_continue()
                 
             elif choice == "7":
@@ -405,12 +490,16 @@ def main():
                 
             else:
                 print(f"\n{Colors.RED}Invalid option — choose 1-7.{Colors.RESET}")
-                time.sleep(2)
+                wait_for_continue()
                 
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}Stopped by user. Goodbye.{Colors.RESET}\n")
     except Exception as e:
         print(f"\n{Colors.RED}Unexpected error: {e}{Colors.RESET}")
+    finally:
+        sys.stdout.flush()
+        if line_buffered:
+            sys.stdout.reconfigure(line_buffering=True)
 
 if __name__ == "__main__":
     main()
@@ -5,20 +5,28 @@ Adaptogen nutritional facts scraper.
 Visits individual product URLs and emits a flattened CSV snapshot.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import httpx
+import lxml.html
+from lxml import etree
 import json
 import csv
-import time
+import os
 import logging
+import operator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 import re
 
+from http_client import HostRateLimiter, fetch_with_retry, run_event_loop
+from page_cache import PageCache
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
+logging.getLogger("httpx").setLevel(logging.WARNING)  # httpx logs every request at INFO
 logger = logging.getLogger(__name__)
 
 HEADERS = {
@@ -29,7 +37,14 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
     "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
 }
-REQUEST_DELAY = 2  # seconds between requests
+REQUEST_DELAY = 2  # seconds; request starts per host are REQUEST_DELAY / MAX_CONCURRENCY apart
+MAX_CONCURRENCY = 16  # product pages in flight per host
+
+CSV_PATH = "dados_extraidos/produtos_nutricionais.csv"
+PARTIAL_SUFFIX = ".part"  # rows land here first; sorted into CSV_PATH when the run completes
+TEMP_SUFFIX = ".tmp"  # the sorted CSV is written here, then moved over CSV_PATH
+FLUSH_EVERY = 10  # rows between explicit flushes of the partial CSV
+PARSER_VERSION = 1  # bump when parsing changes row contents; invalidates cached rows
 
 CSV_COLUMNS = [
     "nome",
@@ -48,6 +63,90 @@ CSV_COLUMNS = [
     "data_coleta",
     "categoria",
 ]
+# Row dict -> CSV cell tuple in column order.
+_ROW_VALUES = operator.itemgetter(*CSV_COLUMNS)
+# Tag for cached rows: parser version plus the column layout they were built for.
+_CACHE_VERSION = f"{PARSER_VERSION}:{','.join(CSV_COLUMNS)}"
+
+# Lower-cased Portuguese row labels (storefront wording) → CSV column.
+NUTRIENT_MAPPING = {
+    "valor energético": "calorias",
+    "carboidratos": "carboidratos",
+    "proteínas": "proteinas",
+    "gorduras totais": "gorduras",
+    "gorduras saturadas": "gorduras_saturadas",
+    "gorduras trans": "gorduras_trans",
+    "fibras alimentares": "fibras",
+    "fibra alimentar": "fibras",
+    "açúcares totais": "acucares",
+    "açucares totais": "acucares",
+    "açúcares adicionados": "acucares_adicionados",
+    "açucares adicionados": "acucares_adicionados",
+    "sódio": "sodio",
+}
+
+# Serving caption ("Porção: 30 g (1 scoop)", "Porção de 2 cápsulas", "PORÇÃO 3 dosadores").
+# After a colon the "<n> g (...)" and "<n> g" forms win over the rest-of-line capture.
+_PORTION_RE = re.compile(
+    r"Porção(?::\s*(\d+\s*g\s*\([^)]+\)|\d+\s*g|.+?(?=\n|<|$))"
+    r"|\s+de\s+(.+?)(?=\n|<|$)"
+    r"|\s+(.+?)(?=\n|<|$))",
+    re.IGNORECASE,
+)
+
+
+def _has_class(tag: str, cls: str) -> etree.XPath:
+    """Compiled XPath for ``tag.cls`` (whitespace-separated class token match)."""
+    return etree.XPath(
+        f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    )
+
+
+# Title selectors as (tag, class token) in priority order (mirrors the old CSS selector list);
+# None matches anything.
+_NAME_SELECTORS = (
+    ("h1", "product_title"),
+    ("h1", "product-title"),
+    ("h1", None),
+    (None, "product-title"),
+    (None, "product_title"),
+)
+# Title candidates: any h1 outranks every class-only match, so the class scan (one
+# pass for both tokens) only runs on pages without an h1.
+_H1_XPATH = etree.XPath("//h1")
+_TITLE_CLASS_XPATH = etree.XPath(
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' product-title ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' product_title ')]"
+)
+_FLOW_DIV_XPATH = _has_class("div", "flow")
+# Nutrition rows (label + value cells) and their cell texts, evaluated in libxml2.
+_ROW_XPATH = etree.XPath("./tr[td[2]]")
+_CELL1_XPATH = etree.XPath("string(td[1])")
+_CELL2_XPATH = etree.XPath("string(td[2])")
+# The storefront is UTF-8 WordPress; pin the codec so libxml2 never falls back to Latin-1.
+_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Tokens scanned for to find the end of the nutrition table: comments and script/style
+# blocks are skipped whole (an unterminated opener ends the scan), then the opening tag of the
+# nutrition facts block (``flow`` class token) and the end of its table. Tag and attribute
+# names are case-insensitive, class tokens are not.
+_SCAN_RE = re.compile(
+    rb"""(?P<skip><!--.*?-->"""
+    rb"""|<(?i:script)\b.*?</(?i:script)\s*>"""
+    rb"""|<(?i:style)\b.*?</(?i:style)\s*>)"""
+    rb"""|(?P<flow><(?i:div)\b[^>]*?\b(?i:class)\s*=\s*["']?[^"'>]*?(?<![\w-])flow(?![\w-]))"""
+    rb"""|(?P<end></(?i:table)\s*>)"""
+    rb"""|(?P<open><!--|<(?i:script|style)\b)""",
+    re.DOTALL,
+)
+
+# One alternation over every label, longest first so overlapping keys resolve to the fuller one.
+_NUTRIENT_RE = re.compile(
+    "|".join(map(re.escape, sorted(NUTRIENT_MAPPING, key=len, reverse=True)))
+)
+# First run of digits / decimal separators; the comma is swapped for a point afterwards.
+_NUMERIC_RE = re.compile(r"[\d.,]+")
+_has_digit = re.compile(r"\d").search
 
 
 def load_product_urls(filepath: str = "json/produtos_urls.json") -> Dict[str, List[str]]:
@@ -62,137 +161,142 @@ def load_product_urls(filepath: str = "json/produtos_urls.json") -> Dict[str, Li
         raise
 
 
-def get_page(url: str) -> Optional[BeautifulSoup]:
-    """GET a product page HTML and return Soup, swallowing transient HTTP errors."""
+class ProductPage(NamedTuple):
+    """PDP bytes plus the validators to revalidate them; ``body`` is None on a 304."""
+
+    body: Optional[bytes]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+async def read_product_page(response: httpx.Response) -> ProductPage:
+    """Download a PDP in full along with its cache validators."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if response.status_code == 304:
+        return ProductPage(None, etag, last_modified)
+    return ProductPage(await response.aread(), etag, last_modified)
+
+
+def _table_cut(content: bytes) -> Optional[int]:
+    """
+    Offset just past the nutrition table, or None if it cannot be located.
+
+    The cut is the first ``</table>`` after the ``div.flow`` opening tag outside comments
+    and scripts; the product title and the table both precede it in the storefront markup,
+    and libxml2 closes the tags left open when only that prefix is parsed.
+    """
+    in_flow = False
+    for match in _SCAN_RE.finditer(content):
+        if match.lastgroup == "open":
+            return None  # unterminated comment/script: everything after it is inert
+        if match.lastgroup == "flow":
+            in_flow = True
+        elif match.lastgroup == "end" and in_flow:
+            return match.end()
+    return None
+
+
+async def get_page(
+    client: httpx.AsyncClient,
+    limiter: HostRateLimiter,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[ProductPage]:
+    """GET a product page HTML, swallowing transient HTTP errors."""
     try:
         logger.info(f"GET {url}")
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        time.sleep(REQUEST_DELAY)
-        return BeautifulSoup(response.content, "lxml")
-    except requests.RequestException as e:
+        return await fetch_with_retry(url, client, limiter, read_product_page, headers)
+    except httpx.HTTPError as e:
         logger.error(f"HTTP error for {url}: {e}")
         return None
 
 
-def extract_product_name(soup: BeautifulSoup) -> str:
-    """Best-effort product title from PDP markup."""
-    selectors = (
-        "h1.product_title",
-        "h1.product-title",
-        "h1",
-        ".product-title",
-        ".product_title",
-    )
+def _text(node: lxml.html.HtmlElement) -> str:
+    """Concatenate stripped text nodes (same result as BeautifulSoup ``get_text(strip=True)``)."""
+    return "".join(t.strip() for t in node.itertext())
+
+
+def _name_rank(element: lxml.html.HtmlElement) -> int:
+    """Index of the first ``_NAME_SELECTORS`` entry ``element`` satisfies."""
+    classes = (element.get("class") or "").split()
+    for rank, (tag, cls) in enumerate(_NAME_SELECTORS):
+        if (tag is None or element.tag == tag) and (cls is None or cls in classes):
+            return rank
+    return len(_NAME_SELECTORS)
 
-    for sel in selectors:
-        node = soup.select_one(sel)
-        if node:
-            return node.get_text(strip=True)
 
-    return "Name not found"
+def extract_product_name(tree: lxml.html.HtmlElement) -> str:
+    """Best-effort product title from PDP markup."""
+    # min() keeps the earliest element in document order among equally ranked ones.
+    candidates = _H1_XPATH(tree) or _TITLE_CLASS_XPATH(tree)
+    best = min(candidates, key=_name_rank, default=None)
+    if best is None:
+        return "Name not found"
+
+    return _text(best)
 
 
 def clean_numeric_value(value: str) -> float:
     """Parse localized numeric nutrient strings → float; blanks become 0.0."""
-    if not value or value.strip() == "":
-        return 0
-
-    cleaned = value.strip().replace(",", ".")
-    match = re.search(r"[\d.]+", cleaned)
+    match = _NUMERIC_RE.search(value) if value else None
     if match:
         try:
-            return float(match.group())
+            return float(match.group().replace(",", "."))
         except ValueError:
             return 0
 
     return 0
 
 
-def extract_portion(table) -> str:
+def _portion_candidates(table: lxml.html.HtmlElement) -> Iterator[str]:
+    """Texts that may carry the serving caption, in the order they are searched."""
+    thead = table.find(".//thead")
+    if thead is not None:
+        colspan_th = thead.find(".//th[@colspan]")
+        if colspan_th is not None:
+            for elem in colspan_th.xpath(".//strong | .//p"):
+                yield elem.text_content()
+            yield colspan_th.text_content()
+
+        for th in thead.iter("th"):
+            yield th.text_content()
+
+    tbody = table.find(".//tbody")
+    if tbody is not None:
+        row0 = tbody.find(".//tr")
+        if row0 is not None:
+            for cell in row0.xpath(".//td | .//th"):
+                yield cell.text_content()
+
+
+def extract_portion(table: lxml.html.HtmlElement) -> str:
     """
     Extract serving/portions text tailored to Adaptogen PDP tables (`Porção:` lines).
 
     Table copy remains Portuguese on the storefront; regex anchors must match PT wording.
     """
-    patterns = [
-        r"Porção:\s*(\d+\s*g\s*\([^)]+\))",
-        r"Porção:\s*(\d+\s*g)",
-        r"Porção:\s*(\d+\s*g\s*\(\d+\s*unidade[s]?\))",
-        r"Porção:\s*(.+?)(?:\n|<|$)",
-        r"Porção de\s+(.+?)(?:\n|<|$)",
-        r"Porção\s+de\s+(.+?)(?:\n|<|$)",
-        r"Porção\s+(.+?)(?:\n|<|$)",
-    ]
-
-    thead = table.find("thead")
-    if thead:
-        colspan_th = thead.find("th", {"colspan": True})
-        if colspan_th:
-            for elem in colspan_th.find_all(["strong", "p"]):
-                text = elem.get_text()
-                for pattern in patterns:
-                    m = re.search(pattern, text, re.IGNORECASE)
-                    if m:
-                        txt = " ".join(m.group(1).strip().split())
-                        return txt
-
-            text_full = colspan_th.get_text()
-            for pattern in patterns:
-                m = re.search(pattern, text_full, re.IGNORECASE)
-                if m:
-                    return " ".join(m.group(1).strip().split())
-
-        for th in thead.find_all("th"):
-            txt = th.get_text()
-            for pattern in patterns:
-                m = re.search(pattern, txt, re.IGNORECASE)
-                if m:
-                    return " ".join(m.group(1).strip().split())
-
-    tbody = table.find("tbody")
-    if tbody:
-        row0 = tbody.find("tr")
-        if row0:
-            for cell in row0.find_all(["td", "th"]):
-                text = cell.get_text()
-                if "porção" in text.lower():
-                    for pattern in patterns:
-                        m = re.search(pattern, text, re.IGNORECASE)
-                        if m:
-                            return " ".join(m.group(1).strip().split())
-
-                    if "de" in text.lower():
-                        chunks = text.split("de", 1)
-                        if len(chunks) > 1:
-                            return " ".join(chunks[1].strip().split())
-
-                    stripped = (
-                        text.replace("Porção", "")
-                        .replace("porção", "")
-                        .strip()
-                    )
-                    stripped = " ".join(stripped.split())
-                    if stripped:
-                        return stripped
+    for text in _portion_candidates(table):
+        m = _PORTION_RE.search(text)
+        if m:
+            return " ".join(m.group(m.lastindex).split())  # only one branch captures
 
     return ""
 
 
-def parse_nutritional_table(soup: BeautifulSoup) -> Optional[Dict]:
+def parse_nutritional_table(tree: lxml.html.HtmlElement) -> Optional[Dict]:
     """
     Parse the PDP nutrition table housed under ``div.flow``.
 
     Nutrient labels mirror Brazilian storefront wording; mapping keys intentionally stay Portuguese.
+    Returns None without logging when there is no table; ``_parse`` may retry on more markup.
     """
-    flow_div = soup.find("div", class_="flow")
-    if not flow_div:
-        logger.warning("Could not locate div.flow")
+    flow_divs = _FLOW_DIV_XPATH(tree)
+    if not flow_divs:
         return None
 
-    table = flow_div.find("table")
-    if not table:
-        logger.warning("No nested <table> under div.flow")
+    table = flow_divs[0].find(".//table")
+    if table is None:
         return None
 
     data = {
@@ -211,71 +315,91 @@ def parse_nutritional_table(soup: BeautifulSoup) -> Optional[Dict]:
 
     data["porcao"] = extract_portion(table)
 
-    nutrient_mapping = {
-        "valor energético": "calorias",
-        "carboidratos": "carboidratos",
-        "proteínas": "proteinas",
-        "gorduras totais": "gorduras",
-        "gorduras saturadas": "gorduras_saturadas",
-        "gorduras trans": "gorduras_trans",
-        "fibras alimentares": "fibras",
-        "fibra alimentar": "fibras",
-        "açúcares totais": "acucares",
-        "açucares totais": "acucares",
-        "açúcares adicionados": "acucares_adicionados",
-        "açucares adicionados": "acucares_adicionados",
-        "sódio": "sodio",
-    }
+    tbody = table.find(".//tbody")
+    if tbody is not None:
+        for row in _ROW_XPATH(tbody):
+            value = _CELL2_XPATH(row)
+            if not _has_digit(value):
+                continue  # "Não contém", "**", footnotes: the field keeps its 0 default
+            m = _NUTRIENT_RE.search(_CELL1_XPATH(row).lower())
+            if m:
+                data[NUTRIENT_MAPPING[m.group()]] = clean_numeric_value(value)
 
-    tbody = table.find("tbody")
-    if tbody:
-        for row in tbody.find_all("tr"):
-            cells = row.find_all("td")
-            if len(cells) >= 2:
-                nutrient_name = cells[0].get_text(strip=True).lower()
-                nutrient_value = cells[1].get_text(strip=True)
+    return data
 
-                for key_sl, csv_key in nutrient_mapping.items():
-                    if key_sl in nutrient_name:
-                        data[csv_key] = clean_numeric_value(nutrient_value)
-                        break
 
-    return data
+def _parse(content: bytes, url: str, categoria: str, timestamp: str) -> Optional[Dict]:
+    """
+    Turn PDP bytes into a flattened row dict aligned with CSV_COLUMNS.
+
+    Runs inside the parser process pool, so it takes and returns only picklable values.
+    Only the markup up to the nutrition table is parsed when that cut can be found.
+    """
+    cut = _table_cut(content)
+    tree = lxml.html.document_fromstring(content[:cut], parser=_HTML_PARSER)
+    nutritional = parse_nutritional_table(tree)
+    if not nutritional and cut is not None:
+        # The cut point was a false positive (e.g. markup echoed in an attribute).
+        tree = lxml.html.document_fromstring(content, parser=_HTML_PARSER)
+        nutritional = parse_nutritional_table(tree)
+    if not nutritional:
+        return None
 
+    name = extract_product_name(tree)
+
+    return {
+        "nome": name,
+        "url": url,
+        **nutritional,
+        "data_coleta": timestamp,
+        "categoria": categoria,
+    }
+
+
+async def scrape_product(
+    client: httpx.AsyncClient,
+    limiter: HostRateLimiter,
+    pool: ProcessPoolExecutor,
+    cache: PageCache,
+    url: str,
+    categoria: str,
+    timestamp: str,
+) -> Optional[Dict]:
+    """
+    Fetch a single PDP and parse it on ``pool`` into a row dict aligned with CSV_COLUMNS.
 
-def scrape_product(url: str, categoria: str) -> Optional[Dict]:
-    """Scrape a single PDP into a flattened row dict aligned with CSV_COLUMNS."""
+    Pages seen before are revalidated against ``cache``; a 304 reuses the stored row.
+    ``timestamp`` is the run's ``data_coleta`` value.
+    """
     try:
-        soup = get_page(url)
-        if not soup:
-            return None
+        cached = cache.get(url)
+        headers = cached.conditional_headers() if cached else None
 
-        name = extract_product_name(soup)
+        page = await get_page(client, limiter, url, headers)
+        if page is None:
+            return None
 
-        nutritional = parse_nutritional_table(soup)
-        if not nutritional:
-            logger.warning(f"No nutrition table for «{name}» ({url})")
+        if page.body is None:
+            if cached is None:
+                logger.error(f"{url}: unexpected 304 for an uncached page")
+                return None
+            logger.info(f"✓ unchanged {cached.parsed['nome']}")
+            return {
+                **cached.parsed,
+                "data_coleta": timestamp,
+                "categoria": categoria,
+            }
+
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(pool, _parse, page.body, url, categoria, timestamp)
+        if payload is None:
+            logger.warning(f"No nutrition table (div.flow > table) at {url}")
             return None
 
-        payload = {
-            "nome": name,
-            "url": url,
-            "porcao": nutritional["porcao"],
-            "calorias": nutritional["calorias"],
-            "carboidratos": nutritional["carboidratos"],
-            "proteinas": nutritional["proteinas"],
-            "gorduras": nutritional["gorduras"],
-            "gorduras_saturadas": nutritional["gorduras_saturadas"],
-            "gorduras_trans": nutritional["gorduras_trans"],
-            "fibras": nutritional["fibras"],
-            "acucares": nutritional["acucares"],
-            "acucares_adicionados": nutritional["acucares_adicionados"],
-            "sodio": nutritional["sodio"],
-            "data_coleta": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "categoria": categoria,
-        }
-
-        logger.info(f"✓ scraped {name}")
+        if page.etag or page.last_modified:
+            cache.put(url, page.etag, page.last_modified, payload)
+
+        logger.info(f"✓ scraped {payload['nome']}")
         return payload
 
     except Exception as e:
@@ -283,21 +407,57 @@ def scrape_product(url: str, categoria: str) -> Optional[Dict]:
         return None
 
 
-def save_to_csv(rows: List[Dict], filepath: str) -> None:
-    """Write UTF-8 CSV with header row pulled from CSV_COLUMNS."""
+def load_scraped_rows(filepath: str) -> Set[Tuple[str, str]]:
+    """
+    ``(categoria, url)`` pairs already written to a partial CSV left by an interrupted run.
+
+    A torn trailing row (no final newline) is trimmed so appending resumes cleanly.
+    """
     try:
-        with open(filepath, "w", encoding="utf-8", newline="") as fh:
-            writer = csv.DictWriter(fh, fieldnames=CSV_COLUMNS)
-            writer.writeheader()
-            writer.writerows(rows)
-        logger.info(f"CSV written to {filepath}")
-    except Exception as e:
-        logger.error(f"CSV write failed: {e}")
-        raise
+        with open(filepath, "r+", encoding="utf-8", newline="") as fh:
+            text = fh.read()
+            if text and not text.endswith("\n"):
+                text = text[: text.rfind("\n") + 1]
+                fh.seek(0)
+                fh.write(text)
+                fh.truncate()
+    except FileNotFoundError:
+        return set()
+
+    return {
+        (row["categoria"], row["url"])
+        for row in csv.DictReader(text.splitlines())
+        if row.get("url")
+    }
 
 
-def main() -> None:
-    """Batch-scrape products referenced inside ``produtos_urls.json``."""
+def finalize_csv(partial_path: str, order: Dict[Tuple[str, str], int]) -> None:
+    """
+    Write the finished partial CSV to CSV_PATH with rows in job order, then drop it.
+
+    Rows reach the partial file in completion order; ``order`` maps ``(categoria, url)``
+    to its position in ``produtos_urls.json`` so the final CSV diffs stably between runs.
+    """
+    with open(partial_path, encoding="utf-8", newline="") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, CSV_COLUMNS)
+        rows = list(reader)
+
+    url_i, category_i = header.index("url"), header.index("categoria")
+    rows.sort(key=lambda r: order.get((r[category_i], r[url_i]), len(order)))
+
+    # Replace CSV_PATH atomically so an interrupted write never clobbers the previous CSV.
+    temp_path = CSV_PATH + TEMP_SUFFIX
+    with open(temp_path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(header)
+        writer.writerows(rows)
+    os.replace(temp_path, CSV_PATH)
+    os.remove(partial_path)
+
+
+async def async_main() -> None:
+    """Batch-scrape products referenced inside ``produtos_urls.json`` concurrently."""
     logger.info("Nutrition scrape starting...")
 
     try:
@@ -306,35 +466,65 @@ def main() -> None:
         logger.error("Aborting — run ``python url_collector.py`` (or CLI option 1) first.")
         return
 
-    aggregated: List[Dict] = []
-    total_urls = sum(len(lst) for lst in by_category.values())
+    partial_path = CSV_PATH + PARTIAL_SUFFIX
+    done = load_scraped_rows(partial_path)
+    if done:
+        logger.info(f"Resuming interrupted run: {len(done)} product(s) already in {partial_path}")
+
+    jobs = [
+        (u, category)
+        for category, urls in by_category.items()
+        for u in urls
+        if (category, u) not in done
+    ]
+    total_urls = len(jobs)
     processed = success = failed = 0
 
     logger.info("\n%s", "=" * 60)
     logger.info("Products queued: %d", total_urls)
-    logger.info("%s\n", "=" * 60)
-
     for category, urls in by_category.items():
-        logger.info("\n%s", "=" * 60)
-        logger.info("Category: %s", category.upper())
-        logger.info("URLs in bucket: %d", len(urls))
-        logger.info("%s\n", "=" * 60)
-
-        for u in urls:
-            processed += 1
-            logger.info("[%d/%d]", processed, total_urls)
-
-            row = scrape_product(u, category)
-
-            if row:
-                aggregated.append(row)
-                success += 1
-            else:
-                failed += 1
+        logger.info("  %s: %d", category, len(urls))
+    logger.info("%s\n", "=" * 60)
 
-    if aggregated:
-        csv_path = "dados_extraidos/produtos_nutricionais.csv"
-        save_to_csv(aggregated, csv_path)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # one data_coleta per run
+    limiter = HostRateLimiter(MAX_CONCURRENCY, REQUEST_DELAY / MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+    os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
+    pool = ProcessPoolExecutor(max_workers=os.cpu_count())  # lxml parsing off the event loop
+    cache = PageCache(_CACHE_VERSION)
+    with pool, cache, open(partial_path, "a", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        if fh.tell() == 0:
+            writer.writerow(CSV_COLUMNS)
+
+        async with httpx.AsyncClient(
+            http2=True, headers=HEADERS, timeout=30, limits=limits, follow_redirects=True
+        ) as client:
+
+            async def run(u: str, category: str) -> None:
+                nonlocal processed, success, failed
+                row = await scrape_product(client, limiter, pool, cache, u, category, timestamp)
+                processed += 1
+                if row:
+                    writer.writerow(_ROW_VALUES(row))
+                    success += 1
+                    if success % FLUSH_EVERY == 0:
+                        fh.flush()
+                        cache.commit()
+                else:
+                    failed += 1
+                logger.info("[%d/%d]", processed, total_urls)
+
+            await asyncio.gather(*(run(u, category) for u, category in jobs))
+
+    if success or done:
+        keys = ((category, u) for category, urls in by_category.items() for u in urls)
+        order = {key: i for i, key in enumerate(keys)}
+        finalize_csv(partial_path, order)
+        logger.info(f"CSV written to {CSV_PATH}")
+    else:
+        os.remove(partial_path)
 
     pct = (success / processed * 100) if processed else 0.0
     logger.info("\n%s", "=" * 60)
@@ -348,5 +538,10 @@ def main() -> None:
     logger.info("Done.")
 
 
+def main() -> None:
+    """Batch-scrape products referenced inside ``produtos_urls.json``."""
+    run_event_loop(async_main())
+
+
 if __name__ == "__main__":
     main()
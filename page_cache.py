@@ -0,0 +1,88 @@
+"""
+On-disk cache of product-page validators for conditional requests.
+
+Each PDP URL keeps the ``ETag`` / ``Last-Modified`` of its last full download together
+with the row parsed from it, so a ``304 Not Modified`` can be answered from disk. Rows are
+tagged with the caller's parser version; entries from another version read as misses.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Dict, NamedTuple, Optional
+
+CACHE_PATH = "cache/pages.sqlite"
+
+
+class CachedPage(NamedTuple):
+    """Validators and parsed row stored for one URL."""
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    parsed: Dict
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """``If-None-Match`` / ``If-Modified-Since`` headers revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    SQLite-backed ``url -> CachedPage`` store; use as a context manager.
+
+    ``version`` identifies the parser (and row layout) that produced the stored rows;
+    entries written under any other version are ignored and overwritten.
+    """
+
+    def __init__(self, version: str, path: str = CACHE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.version = version
+        self._db = sqlite3.connect(path)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(pages)")}
+        if columns and "version" not in columns:
+            self._db.execute("DROP TABLE pages")  # pre-versioning layout; the cache is disposable
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, version TEXT NOT NULL, "
+            "etag TEXT, last_modified TEXT, parsed TEXT NOT NULL)"
+        )
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Entry stored for ``url`` by the current version, if any."""
+        row = self._db.execute(
+            "SELECT etag, last_modified, parsed FROM pages WHERE url = ? AND version = ?",
+            (url, self.version),
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, parsed = row
+        return CachedPage(etag, last_modified, json.loads(parsed))
+
+    def put(
+        self, url: str, etag: Optional[str], last_modified: Optional[str], parsed: Dict
+    ) -> None:
+        """Insert or replace the entry for ``url``."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO pages (url, version, etag, last_modified, parsed) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (url, self.version, etag, last_modified, json.dumps(parsed, ensure_ascii=False)),
+        )
+
+    def commit(self) -> None:
+        """Persist pending writes."""
+        self._db.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self) -> "PageCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -5,17 +5,23 @@ Adaptogen URL collector.
 Fetches product page URLs across Adaptogen storefront categories.
 """
 
-import requests
+import asyncio
+import httpx
 from bs4 import BeautifulSoup
 import json
-import time
 import logging
-from typing import List, Dict
+import re
+from functools import partial
+from typing import List, Dict, Optional
+from urllib.parse import urljoin
+
+from http_client import HostRateLimiter, fetch_with_retry, run_event_loop
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
+logging.getLogger("httpx").setLevel(logging.WARNING)  # httpx logs every request at INFO
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://adaptogen.com.br"
@@ -27,66 +33,61 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
     "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
 }
-REQUEST_DELAY = 2  # seconds between consecutive HTTP requests
+REQUEST_DELAY = 2  # seconds; request starts per host are REQUEST_DELAY / MAX_CONCURRENCY apart
+MAX_CONCURRENCY = 16  # listing pages in flight per host
+PAGE_WINDOW = 8  # protein listing pages requested speculatively per round
+
+# WooCommerce empty-state headline (Brazilian storefront copy) closing the protein pagination.
+_EMPTY_LISTING_RE = re.compile(rb"<h3[^>]*>\s*Nenhum produto encontrado\s*</h3>")
 
 
-def get_page(url: str) -> BeautifulSoup:
+async def fetch_html(
+    client: httpx.AsyncClient, limiter: HostRateLimiter, url: str
+) -> bytes:
     """
-    Fetch a URL and return a BeautifulSoup document.
+    Fetch a URL and return the raw HTML body.
 
     Raises:
-        requests.RequestException: on transport or HTTP failure.
+        httpx.HTTPError: on transport or HTTP failure, including timeouts.
     """
     try:
         logger.info(f"Fetching: {url}")
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        time.sleep(REQUEST_DELAY)
-        return BeautifulSoup(response.content, "lxml")
-    except requests.RequestException as e:
+        return await fetch_with_retry(url, client, limiter)
+    except httpx.HTTPError as e:
         logger.error(f"Failed to fetch {url}: {e}")
         raise
 
 
+async def get_page(
+    client: httpx.AsyncClient, limiter: HostRateLimiter, url: str
+) -> BeautifulSoup:
+    """Fetch a URL and return a BeautifulSoup document; raises like ``fetch_html``."""
+    return BeautifulSoup(await fetch_html(client, limiter, url), "lxml")
+
+
 def extract_product_urls(soup: BeautifulSoup, base_url: str = BASE_URL) -> List[str]:
     """
     Extract absolute product URLs from a listing/category page HTML.
     """
-    urls = []
-
     links = soup.find_all("a", class_="woocommerce-LoopProduct-link")
 
     if not links:
         links = soup.find_all("a", href=True)
         links = [link for link in links if "/produto/" in link.get("href", "")]
 
-    for link in links:
-        href = link.get("href")
-        if href:
-            if href.startswith("http"):
-                urls.append(href)
-            elif href.startswith("/"):
-                urls.append(f"{base_url}{href}")
-            else:
-                urls.append(f"{base_url}/{href}")
-
-    seen = set()
-    unique: List[str] = []
-    for u in urls:
-        if u not in seen:
-            seen.add(u)
-            unique.append(u)
+    join = partial(urljoin, base_url + "/")
+    urls = [join(link["href"]) for link in links if link.get("href")]
 
-    return unique
+    return list(dict.fromkeys(urls))
 
 
-def scrape_pre_workout() -> List[str]:
+async def scrape_pre_workout(client: httpx.AsyncClient, limiter: HostRateLimiter) -> List[str]:
     """Collect URLs from the Pre-workout category."""
     logger.info("Crawling pre-workout category...")
     url = f"{BASE_URL}/pre-treino"
 
     try:
-        soup = get_page(url)
+        soup = await get_page(client, limiter, url)
         urls = extract_product_urls(soup)
         logger.info(f"{len(urls)} pre-workout products found")
         return urls
@@ -95,13 +96,13 @@ def scrape_pre_workout() -> List[str]:
         return []
 
 
-def scrape_snacks() -> List[str]:
+async def scrape_snacks(client: httpx.AsyncClient, limiter: HostRateLimiter) -> List[str]:
     """Collect URLs from protein snacks listing."""
     logger.info("Crawling protein snacks...")
     url = f"{BASE_URL}/proteinas/snacks-proteicos/"
 
     try:
-        soup = get_page(url)
+        soup = await get_page(client, limiter, url)
         urls = extract_product_urls(soup)
         logger.info(f"{len(urls)} snack products found")
         return urls
@@ -110,13 +111,13 @@ def scrape_snacks() -> List[str]:
         return []
 
 
-def scrape_creatine() -> List[str]:
+async def scrape_creatine(client: httpx.AsyncClient, limiter: HostRateLimiter) -> List[str]:
     """Collect URLs from the creatine category."""
     logger.info("Crawling creatine...")
     url = f"{BASE_URL}/creatina/"
 
     try:
-        soup = get_page(url)
+        soup = await get_page(client, limiter, url)
         urls = extract_product_urls(soup)
         logger.info(f"{len(urls)} creatine products found")
         return urls
@@ -125,42 +126,74 @@ def scrape_creatine() -> List[str]:
         return []
 
 
-def scrape_proteins() -> List[str]:
+async def fetch_protein_listing(
+    client: httpx.AsyncClient, limiter: HostRateLimiter, page: int
+) -> Optional[List[str]]:
     """
-    Paginate `/proteinas/` with `sf_paged` query param until WooCommerce stops.
+    Product URLs on protein listing ``page``; None when the empty-state headline shows.
 
-    Pagination ends when Portuguese empty-state headline appears (Brazilian storefront copy).
+    Unlike ``fetch_html`` this does not log failures: the page may be one ``scrape_proteins``
+    fetched speculatively and then discarded, so it reports the failures it actually uses.
     """
-    logger.info("Crawling proteins (paginated)...")
-    collected: List[str] = []
-    page = 1
-
-    while True:
-        url = f"{BASE_URL}/proteinas/?sf_paged={page}"
+    url = f"{BASE_URL}/proteinas/?sf_paged={page}"
+    logger.info(f"Fetching: {url}")
+    content = await fetch_with_retry(url, client, limiter)
 
-        try:
-            soup = get_page(url)
+    # Terminal pages are detected on the raw bytes so they never get parsed.
+    if _EMPTY_LISTING_RE.search(content):
+        return None
 
-            empty = soup.find("h3", string="Nenhum produto encontrado")
-            if empty:
-                logger.info(f"Reached end of pagination at page={page}")
-                break
+    return extract_product_urls(BeautifulSoup(content, "lxml"))
 
-            page_urls = extract_product_urls(soup)
 
-            if not page_urls:
-                logger.info(f"No products on page {page}; assuming end of pagination")
-                break
+async def scrape_proteins(client: httpx.AsyncClient, limiter: HostRateLimiter) -> List[str]:
+    """
+    Paginate `/proteinas/` with `sf_paged` query param until WooCommerce stops.
 
-            collected.extend(page_urls)
-            logger.info(f"Page {page}: {len(page_urls)} products")
-            page += 1
+    Pages are requested speculatively in windows of ``PAGE_WINDOW``; requests past the
+    first empty page are cancelled and their results (or failures) discarded. Pagination ends when the Portuguese empty-state
+    headline appears (Brazilian storefront copy).
+    """
+    logger.info("Crawling proteins (paginated)...")
+    collected: List[str] = []
+    first = 1
+    done = False
 
-        except Exception as e:
-            logger.error(f"Protein pagination failed at page={page}: {e}")
-            break
+    while not done:
+        pages = range(first, first + PAGE_WINDOW)
+        tasks = [
+            asyncio.create_task(fetch_protein_listing(client, limiter, p)) for p in pages
+        ]
 
-    unique = list(set(collected))
+        try:
+            for page, task in zip(pages, tasks):
+                try:
+                    page_urls = await task
+                except Exception as e:
+                    logger.error(f"Protein pagination failed at page={page}: {e}")
+                    done = True
+                    break
+                if page_urls is None:
+                    logger.info(f"Reached end of pagination at page={page}")
+                    done = True
+                    break
+                if not page_urls:
+                    logger.info(f"No products on page {page}; assuming end of pagination")
+                    done = True
+                    break
+
+                collected.extend(page_urls)
+                logger.info(f"Page {page}: {len(page_urls)} products")
+        finally:
+            # Pages past the end are not needed: stop them (including any retry backoff)
+            # and collect their outcomes so nothing is left pending or unretrieved.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        first += PAGE_WINDOW
+
+    unique = list(dict.fromkeys(collected))
     logger.info(f"Total protein products collected (deduped): {len(unique)}")
     return unique
 
@@ -176,15 +209,28 @@ def save_to_json(data: Dict[str, List[str]], filepath: str) -> None:
         raise
 
 
-def main() -> None:
-    """Orchestrate all category crawls."""
+async def async_main() -> None:
+    """Orchestrate all category crawls concurrently."""
     logger.info("Starting Adaptogen product URL crawl...")
 
+    limiter = HostRateLimiter(MAX_CONCURRENCY, REQUEST_DELAY / MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+    async with httpx.AsyncClient(
+        http2=True, headers=HEADERS, timeout=30, limits=limits, follow_redirects=True
+    ) as client:
+        pre_workout, snacks, proteins, creatine = await asyncio.gather(
+            scrape_pre_workout(client, limiter),
+            scrape_snacks(client, limiter),
+            scrape_proteins(client, limiter),
+            scrape_creatine(client, limiter),
+        )
+
     product_urls = {
-        "pre-treino": scrape_pre_workout(),
-        "snacks": scrape_snacks(),
-        "proteinas": scrape_proteins(),
-        "creatinas": scrape_creatine(),
+        "pre-treino": pre_workout,
+        "snacks": snacks,
+        "proteinas": proteins,
+        "creatinas": creatine,
     }
 
     grand_total = sum(len(u) for u in product_urls.values())
@@ -201,5 +247,10 @@ def main() -> None:
     logger.info("URL crawl finished successfully.")
 
 
+def main() -> None:
+    """Orchestrate all category crawls."""
+    run_event_loop(async_main())
+
+
 if __name__ == "__main__":
     main()